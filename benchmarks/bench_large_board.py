@@ -0,0 +1,98 @@
+"""
+Per-move latency (time spent in GameRound.action for all clicks of a turn) and memory (traced peak and at the end,
+ incl. benchmark's own allocations) of a game, sweeping board sizes with random positions of many kings (plus men),
+ played by random legal clicks.
+Run from repo root: python -m benchmarks.bench_large_board [--sizes 8 16 26 52] [--moves 200]
+"""
+import argparse
+import random
+import tracemalloc
+from statistics import median
+from time import perf_counter
+
+import numpy as np
+
+from model.engine import GameRound, MakingMove
+from model.gridlike import Board, PieceType, Owner
+
+
+def random_position(n: int, rng: random.Random, kings_per_side: int, men_per_side: int) -> Board:
+    board = Board(w=n, h=n)
+    board.val_arr[board.val_arr != PieceType.EMPTY_LIGHT] = PieceType.EMPTY_DARK
+    dark = [tuple(map(int, rc)) for rc in np.argwhere(board.val_arr == PieceType.EMPTY_DARK)]
+    squares = rng.sample(dark, min(len(dark), 2 * (kings_per_side + men_per_side)))
+    pieces = [PieceType.P1C, PieceType.P2C] * kings_per_side + [PieceType.P1, PieceType.P2] * men_per_side
+    for rc, piece in zip(squares, pieces):
+        if piece == PieceType.P1 and rc[0] == 0 or piece == PieceType.P2 and rc[0] == n - 1:
+            piece = PieceType.crown(piece)  # man on own last row
+        board[rc] = piece
+    return board
+
+
+def destinations(game: GameRound, piece_rc: tuple[int, int]) -> set[tuple[int, int]]:
+    return MakingMove(context=game, selection_piece_rc=piece_rc, selection_piece_value=game.board[piece_rc]
+                      ).allowed_destinations
+
+
+def play_move(game: GameRound, rng: random.Random) -> float | None:
+    """Clicks a random legal piece and destination(s) until the turn passes, returns seconds spent in action"""
+    player = game.current_player
+    candidates = game.state.player_attacking_pieces() or \
+        {rc for rc in game.board.get_coords_for_all_own_pieces(player) if destinations(game, rc)}
+    if not candidates:
+        return None
+    piece_rc = rng.choice(sorted(candidates))
+    targets = sorted(destinations(game, piece_rc))
+    elapsed = 0.
+    for click in (piece_rc, rng.choice(targets)):
+        t0 = perf_counter()
+        game.action(square_rowcol=click)
+        elapsed += perf_counter() - t0
+    while not game.over and game.current_player == player:  # multi-jump continues with the same piece
+        click = rng.choice(sorted(game.state.allowed_destinations))
+        t0 = perf_counter()
+        game.action(square_rowcol=click)
+        elapsed += perf_counter() - t0
+    game.view_update_signals.clear()
+    return elapsed
+
+
+def playout(n: int, n_moves: int, seed: int) -> tuple[GameRound, list[float]]:
+    rng = random.Random(seed)
+    kings, men = max(2, n), max(2, n // 2)  # e.g. 26 kings and 13 men per side on 26x26
+    game = GameRound(board=random_position(n, rng, kings, men), current_player=Owner.P1)
+    latencies = []
+    while not game.over and len(latencies) < n_moves:
+        if (elapsed := play_move(game, rng)) is None:
+            break
+        latencies.append(elapsed)
+    return game, latencies
+
+
+def run(n: int, n_moves: int, seed: int = 0) -> dict:
+    _, latencies = playout(n, n_moves, seed)
+    latencies.sort()
+    tracemalloc.start()  # same game again, traced separately as tracing slows allocations down
+    game, _ = playout(n, n_moves, seed)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'n': n, 'moves': len(latencies), 'median_ms': median(latencies) * 1e3,
+            'p95_ms': latencies[int(0.95 * (len(latencies) - 1))] * 1e3, 'max_ms': latencies[-1] * 1e3,
+            'peak_kib': peak / 1024, 'end_kib': current / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[8, 12, 16, 20, 26, 40, 52])
+    parser.add_argument('--moves', type=int, default=200)
+    args = parser.parse_args()
+    print(f"{'board':>7} {'moves':>5} {'median ms':>10} {'p95 ms':>8} {'max ms':>8} "
+          f"{'peak KiB':>9} {'end KiB':>8}")
+    for n in args.sizes:
+        r = run(n, args.moves)
+        print(f"{r['n']:>4}x{r['n']:<2} {r['moves']:>5} {r['median_ms']:>10.2f} {r['p95_ms']:>8.2f} "
+              f"{r['max_ms']:>8.2f} {r['peak_kib']:>9.1f} {r['end_kib']:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+Seek time of Replay.board_at to every ply (in random order) of a long random game, per keyframe interval;
+ an interval longer than the game means replaying all moves from the initial board.
+Run from repo root: python -m benchmarks.bench_replay
+"""
+import random
+from statistics import mean
+from time import perf_counter
+
+from model.engine import GameRound
+from model.gridlike import Board
+from model.replay import Replay
+from benchmarks.bench_large_board import play_move
+
+
+def long_game(min_plies: int = 200, n: int = 16) -> tuple[GameRound, list]:
+    """Random game of at least min_plies moves (capped there), with the board after each of them"""
+    for seed in range(100):
+        rng, game = random.Random(seed), GameRound(board=Board(w=n, h=n))
+        boards = [game.board.val_arr.copy()]
+        while not game.over and len(game.history) < min_plies and play_move(game, rng) is not None:
+            boards.append(game.board.val_arr.copy())
+        if len(game.history) >= min_plies:
+            return game, boards
+    raise RuntimeError(f"No random game reached {min_plies} plies")
+
+
+def main():
+    game, boards = long_game()
+    plies = list(range(len(game.history) + 1))
+    print(f'{len(game.history)}-ply game on {game.board.h}x{game.board.w}')
+    for keyframe_interval in (1, 8, 16, 32, len(plies)):
+        replay = Replay(game, keyframe_interval=keyframe_interval)
+        random.Random(0).shuffle(plies)
+        seconds = []
+        for ply in plies:
+            t0 = perf_counter()
+            board = replay.board_at(ply)
+            seconds.append(perf_counter() - t0)
+            assert (board.val_arr == boards[ply]).all()
+        label = 'no keyframes' if keyframe_interval == len(plies) else f'keyframe every {keyframe_interval}'
+        print(f'{label:<20} seek mean {mean(seconds) * 1e6:7.1f} us, max {max(seconds) * 1e6:7.1f} us '
+              f'(incl. building keyframes), {len(replay.keyframes)} keyframes')
+
+
+if __name__ == '__main__':
+    main()
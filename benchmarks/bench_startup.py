@@ -0,0 +1,37 @@
+"""
+Startup import cost (python -X importtime, best of several runs) of the headless/CLI path, i.e. the controller and
+ model only, vs. also importing the web view (as mvc.py did unconditionally before UI backends were resolved lazily).
+Run from repo root: python -m benchmarks.bench_startup
+"""
+import subprocess
+import sys
+
+RUNS = 7
+CASES = {'headless (import mvc)': 'import mvc',
+         'cli (mvc + view.cli_poc_only)': 'import mvc, view.cli_poc_only',
+         'web (mvc + view.web)': 'import mvc, view.web'}
+
+
+def import_time_us(statement: str) -> int:
+    """Sum of cumulative import times of top-level imports triggered by statement"""
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            capture_output=True, text=True, check=True).stderr
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line.split('|')
+        if not name.startswith('   '):  # one space separator, nested imports are further indented
+            total += int(cumulative_us)
+    return total
+
+
+def main():
+    results = {label: min(import_time_us(statement) for _ in range(RUNS)) for label, statement in CASES.items()}
+    headless = results['headless (import mvc)']
+    for label, us in results.items():
+        print(f'{label:<32} {us / 1e3:>8.1f} ms  ({us / headless:.1f}x headless)')
+
+
+if __name__ == '__main__':
+    main()
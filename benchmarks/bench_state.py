@@ -0,0 +1,62 @@
+"""
+Requests per second on /state served through the ASGI app in-process (no sockets, no polling delay):
+ generic FastAPI encoding of the Game object (as before pre-serialized snapshots) vs. snapshot bytes vs. 304.
+Run from repo root: python -m benchmarks.bench_state
+"""
+import asyncio
+from time import perf_counter
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from model.engine import GameRound
+from view.web import FastAPIView, Game
+
+
+async def call(app, path: str, headers: list[tuple[bytes, bytes]]) -> int:
+    scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+             'path': path, 'raw_path': path.encode(), 'query_string': b'', 'root_path': '', 'headers': headers,
+             'client': ('127.0.0.1', 1), 'server': ('127.0.0.1', 8000)}
+    status = 0
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    await app(scope, receive, send)
+    return status
+
+
+async def requests_per_second(app, path: str, headers=(), seconds: float = 2.0) -> tuple[float, int]:
+    n, t0 = 0, perf_counter()
+    while (elapsed := perf_counter() - t0) < seconds:
+        status = await call(app, path, list(headers))
+        n += 1
+    return n / elapsed, status
+
+
+def main():
+    game_state = Game(GameRound().boardview_aslist())
+    view = FastAPIView(game_state, state_delay=0)
+    app = view.get_app()
+
+    @app.get("/state_generic")
+    def get_state_generic():  # pre-snapshot behavior: FastAPI encodes vars of the Game object on every request
+        return JSONResponse(jsonable_encoder({'board': game_state.board, 'moves': game_state.moves,
+                                              'is_async': game_state.is_async}))
+
+    etag = game_state.encoded[0].encode()
+    cases = [('generic encoder (before)', '/state_generic', ()),
+             ('snapshot bytes, 200', '/state', ()),
+             ('snapshot, If-None-Match, 304', '/state', ((b'if-none-match', etag),))]
+    for label, path, headers in cases:
+        rps, status = asyncio.run(requests_per_second(app, path, headers))
+        print(f'{label:<32} {rps:>9.0f} req/s  (HTTP {status})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Durable moves per second of GameStore (random games' clicks recorded, until committed) with the cost added to the
+ game loop per click, and recovery time of a game vs. the number of clicks replayed after its latest snapshot.
+Run from repo root: python -m benchmarks.bench_store
+"""
+import os
+import random
+import tempfile
+from time import perf_counter
+
+from model.engine import GameRound
+from model.store import GameStore
+from benchmarks.bench_large_board import play_move
+
+
+class ClickRecorder(GameRound):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.clicks = []
+
+    def action(self, square_rowcol: tuple[int, int]) -> list[bool]:
+        self.clicks.append(square_rowcol)
+        return super().action(square_rowcol=square_rowcol)
+
+
+def random_clicks(n_games: int, seed: int = 0) -> list[list[tuple[int, int]]]:
+    rng, games = random.Random(seed), []
+    for _ in range(n_games):
+        game = ClickRecorder()
+        while not game.over and play_move(game, rng) is not None:
+            pass
+        games.append(game.clicks)
+    return games
+
+
+def durable_moves_per_second(path: str, games: list[list[tuple[int, int]]]) -> tuple[float, float]:
+    store = GameStore(path)
+    in_loop = 0.
+    t0 = perf_counter()
+    for clicks in games:
+        game = GameRound()
+        game_id = store.new_game(game)
+        for click in clicks:
+            game.action(square_rowcol=click)
+            t1 = perf_counter()
+            store.record(game_id, click, game)
+            in_loop += perf_counter() - t1
+    store.flush()
+    elapsed = perf_counter() - t0
+    store.close()
+    n_clicks = sum(map(len, games))
+    return n_clicks / elapsed, in_loop / n_clicks
+
+
+def recovery_seconds(path: str, clicks: list[tuple[int, int]], snapshot_every: int) -> tuple[float, int]:
+    store = GameStore(path, snapshot_every=snapshot_every)
+    game = GameRound()
+    game_id = store.new_game(game)
+    for click in clicks[:-1]:  # unfinished game
+        game.action(square_rowcol=click)
+        store.record(game_id, click, game)
+    store.close()
+
+    t0 = perf_counter()
+    store = GameStore(path)
+    restored_id, restored = store.restore_active()
+    elapsed = perf_counter() - t0
+    assert restored_id == game_id and (restored.board.val_arr == game.board.val_arr).all()
+    replayed = store.seq[game_id] - store.snapshot_seq[game_id]
+    store.close()
+    return elapsed, replayed
+
+
+def main():
+    games = random_clicks(20)
+    with tempfile.TemporaryDirectory() as tmp:
+        rate, per_click = durable_moves_per_second(os.path.join(tmp, 'rate.db'), games)
+        print(f'{sum(map(len, games))} clicks of {len(games)} games: {rate:.0f} durable clicks/s, '
+              f'{per_click * 1e6:.1f} us added to the game loop per click')
+        longest = max(games, key=len)
+        for snapshot_every in (10, 50, 10 ** 6):
+            elapsed, replayed = recovery_seconds(os.path.join(tmp, f'recover{snapshot_every}.db'), longest,
+                                                 snapshot_every)
+            print(f'recovery, snapshot every {snapshot_every} clicks: {elapsed * 1e3:.1f} ms '
+                  f'({replayed} clicks replayed)')
+
+
+if __name__ == '__main__':
+    main()
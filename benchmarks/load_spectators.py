@@ -0,0 +1,104 @@
+"""
+Load test of /spectate: opens many idle server-sent event connections to a web server (child process, Linux /proc
+ used for its CPU time), samples the server's CPU while they idle, then times the fan-out of single moves to all.
+Run from repo root: python -m benchmarks.load_spectators [--spectators 10000] [--idle 15] [--moves 3]
+"""
+import argparse
+import asyncio
+import os
+import random
+import resource
+import subprocess
+import sys
+from time import perf_counter, sleep
+
+PORT = 8765
+
+
+def serve(port: int):
+    """Child process: web view of a game, plays one random move per line received on stdin"""
+    from model.engine import GameRound
+    from view.web import run_server
+    from benchmarks.bench_large_board import play_move
+
+    game, rng = GameRound(), random.Random(0)
+    server, server_thread, game_state = run_server(game, host='127.0.0.1', port=port, backlog=4096,
+                                                   log_level='warning')
+    for _ in sys.stdin:
+        if not game.over:
+            play_move(game, rng)
+        game_state.update_board(game)
+    game_state.close()  # ends the spectators' streams
+    server.should_exit = True
+    server_thread.join()
+
+
+def cpu_seconds(pid: int) -> float:
+    with open(f'/proc/{pid}/stat') as f:
+        utime, stime = f.read().rsplit(')', 1)[1].split()[11:13]
+    return (int(utime) + int(stime)) / os.sysconf('SC_CLK_TCK')
+
+
+async def spectator(port: int, connected: asyncio.Event, received: list):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port, limit=2 ** 20)
+    writer.write(f'GET /spectate HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n\r\n'.encode())
+    await reader.readuntil(b'\r\n\r\n')  # response headers
+    await reader.readuntil(b'\n\n')  # current snapshot, sent on subscribe
+    connected.set()
+    while True:
+        await reader.readuntil(b'\n\n')  # chunked transfer framing is ignored, only counting events
+        received.append(perf_counter())
+
+
+async def load_test(server: subprocess.Popen, n: int, idle: float, n_moves: int):
+    received, tasks = [], []
+    t0 = perf_counter()
+    for batch_start in range(0, n, 500):
+        events = [asyncio.Event() for _ in range(min(500, n - batch_start))]
+        tasks += [asyncio.create_task(spectator(PORT, event, received)) for event in events]
+        await asyncio.wait_for(asyncio.gather(*(event.wait() for event in events)), timeout=60)
+    print(f'{n} spectators connected in {perf_counter() - t0:.1f} s')
+
+    windows = 3
+    for _ in range(windows):
+        cpu0, t0 = cpu_seconds(server.pid), perf_counter()
+        await asyncio.sleep(idle / windows)
+        print(f'idle: server CPU {100 * (cpu_seconds(server.pid) - cpu0) / (perf_counter() - t0):.2f} %')
+
+    for _ in range(n_moves):
+        received.clear()
+        cpu0, t0 = cpu_seconds(server.pid), perf_counter()
+        server.stdin.write(b'move\n')
+        server.stdin.flush()
+        while len(received) < n:
+            await asyncio.sleep(0.01)
+        print(f'move fanned out to {n} spectators in {1e3 * (received[-1] - t0):.0f} ms '
+              f'(server CPU {cpu_seconds(server.pid) - cpu0:.2f} s)')
+    for task in tasks:
+        task.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--spectators', type=int, default=10_000)
+    parser.add_argument('--idle', type=float, default=15., help='seconds of idle CPU sampling')
+    parser.add_argument('--moves', type=int, default=3)
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        return serve(PORT)
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))  # one socket per spectator (in both processes)
+    server = subprocess.Popen([sys.executable, '-m', 'benchmarks.load_spectators', '--serve'], stdin=subprocess.PIPE,
+                              preexec_fn=lambda: resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard)))
+    try:
+        sleep(3)  # server start-up
+        asyncio.run(load_test(server, args.spectators, args.idle, args.moves))
+    finally:
+        server.stdin.close()
+        server.wait(timeout=30)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Opt-in timers/counters around game loop hot paths and live-game profiling.
+
+Set CHECKERS_METRICS=1 before start to wrap the functions decorated with @metrics.timed (when unset they are
+ left undecorated, i.e. no overhead). Set CHECKERS_PROFILE=<file> to capture a cProfile of the game loop, or also
+ CHECKERS_PROFILE_MODE=sampling for a sampling profile of all threads (collapsed stacks, e.g. for flamegraph.pl).
+"""
+import os
+import sys
+import threading
+import logging
+from collections import defaultdict, Counter
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from time import perf_counter, sleep
+from typing import Callable
+
+log = logging.getLogger(__name__)
+
+
+class Metrics:
+    prefix = 'checkers_'
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.timers = defaultdict(lambda: [0, 0.0, 0.0])  # name: [count, total seconds, max seconds]
+        self.counters = defaultdict(int)
+
+    def timed(self, name: str) -> Callable:
+        """Decorator accumulating call count and duration of wrapped function (no-op unless enabled)"""
+        def decorator(f: Callable) -> Callable:
+            if not self.enabled:
+                return f
+
+            @wraps(f)
+            def wrapped(*args, **kwargs):
+                t0 = perf_counter()
+                try:
+                    return f(*args, **kwargs)
+                finally:
+                    self.observe(name, perf_counter() - t0)
+            return wrapped
+        return decorator
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            timer = self.timers[name]
+            timer[0] += 1
+            timer[1] += seconds
+            timer[2] = max(timer[2], seconds)
+
+    def count(self, name: str, n: int = 1):
+        if self.enabled:
+            with self._lock:
+                self.counters[name] += n
+
+    def prometheus_text(self) -> str:
+        """Current values in Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for name, (n, total, longest) in sorted(self.timers.items()):
+                metric = f'{self.prefix}{name}_seconds'
+                lines += [f'# TYPE {metric} summary', f'{metric}_count {n}', f'{metric}_sum {total:.9f}',
+                          f'# TYPE {metric}_max gauge', f'{metric}_max {longest:.9f}']
+            for name, n in sorted(self.counters.items()):
+                lines += [f'# TYPE {self.prefix}{name}_total counter', f'{self.prefix}{name}_total {n}']
+        return '\n'.join(lines) + '\n'
+
+    def summary(self) -> str:
+        with self._lock:
+            parts = [f'{name}: n={n} avg={total / n * 1e3:.3f}ms max={longest * 1e3:.3f}ms'
+                     for name, (n, total, longest) in sorted(self.timers.items()) if n]
+            parts += [f'{name}={n}' for name, n in sorted(self.counters.items())]
+        return '; '.join(parts)
+
+    def start_periodic_log(self, interval: float = 60.0) -> threading.Thread | None:
+        """Logs a summary line every interval seconds from a daemon thread"""
+        if not self.enabled:
+            return None
+
+        def _log_forever():
+            while True:
+                sleep(interval)
+                if summary := self.summary():
+                    log.info("metrics %s", summary)
+
+        thread = threading.Thread(target=_log_forever, name='metrics-log', daemon=True)
+        thread.start()
+        return thread
+
+
+metrics = Metrics(enabled=os.environ.get('CHECKERS_METRICS', '') not in {'', '0'})
+
+
+class SamplingProfiler:
+    """Samples stacks of all threads (except own) and writes them in collapsed format (input of flamegraph.pl)"""
+
+    def __init__(self, path: str, interval: float = 0.005):
+        self.path, self.interval = path, interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name='sampling-profiler', daemon=True)
+
+    def _sample(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                    frame = frame.f_back
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        with open(self.path, 'w') as f:
+            for stack, n in self.stacks.most_common():
+                f.write(f'{stack} {n}\n')
+
+
+@contextmanager
+def _profiling(path: str, mode: str):
+    if mode == 'sampling':
+        profiler = SamplingProfiler(path)
+        profiler.start()
+        try:
+            yield profiler
+        finally:
+            profiler.stop()
+    else:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            profiler.dump_stats(path)  # inspect with python -m pstats <path>
+    log.info("%s profile written to %s", mode, path)
+
+
+def profiled(path: str | None = None, mode: str | None = None):
+    """Context manager capturing a profile to path (defaults from env. variables; does nothing if no path)"""
+    path = path or os.environ.get('CHECKERS_PROFILE')
+    mode = mode or os.environ.get('CHECKERS_PROFILE_MODE', 'cprofile')
+    if not path:
+        return nullcontext()
+    return _profiling(path, mode)
@@ -1,6 +1,5 @@
 from model.engine import GameRound
-from view.web import run_local_webserver
-from view.cli_poc_only import CheckersCLI
+from model.store import GameStore
 from mvc import CheckersController
 
 
@@ -19,32 +18,33 @@ def run_testcase_4x4():
     )
     case_board = Board(test_board=case)
     # print(case_board)
-    # from view.xl import CheckersExcel  # import may not work if MS Office is not installed
 
     move_by = 2  # P1 or P2 (here)
     continued_situation = CheckersController(game_settings={'board': case_board,
                                                             'current_player': move_by},
-                                             # ux=CheckersCLI.use_as_ux  # defaults to webui
-                                             # ux=CheckersExcel.use_as_ux  # defaults to webui
+                                             # ux='cli'  # defaults to 'web'
+                                             # ux='xl'  # defaults to 'web'
                                              )
     continued_situation.start_game()
 
 
 def run_8x8_cli():
-    launched_cli_instance = CheckersController(game_model=GameRound, ux=Checkers_CLI.use_as_ux)
+    launched_cli_instance = CheckersController(game_model=GameRound, ux='cli')
     launched_cli_instance.start_game()
 
 
 def run_8x8_xl():
     # Launch game with Excel UI. On first run, may need to edit DLL path to your MS Excel installation, see /view/xl.py
-    from view.xl import CheckersExcel  # import may not work if MS Office is not installed
-    launched_xl_instance = CheckersController(game_model=GameRound, ux=CheckersExcel.use_as_ux)
+    launched_xl_instance = CheckersController(game_model=GameRound, ux='xl')  # needs MS Office installed
     launched_xl_instance.start_game()
 
 
 if __name__ == "__main__":
+    import logging
+    logging.basicConfig(level=logging.INFO)  # e.g. periodic metrics summary if CHECKERS_METRICS=1
     # run_8x8_cli()
     # run_8x8_xl()
-    launched_instance = CheckersController(game_model=GameRound, ux=run_local_webserver)
+    launched_instance = CheckersController(game_model=GameRound, ux='web',
+                                           game_store=GameStore('checkers.db'))  # resumes unfinished game
     launched_instance.start_game()
     # run_testcase_4x4()
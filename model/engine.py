@@ -2,7 +2,8 @@ import numpy as np
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import IntEnum
-from model.gridlike import Board, PieceType, Owner
+from model.gridlike import Board, PieceType, Owner, ENEMY_PIECES
+from instrumentation import metrics
 from itertools import cycle
 from functools import partial
 from typing import Container, Iterable  #, Self  # later python versions, tested on 3.10
@@ -12,6 +13,21 @@ from collections import defaultdict
 game_over = IntEnum('winner', ['unknown', 'p1', 'p2'], start=0)
 
 
+@dataclass(frozen=True)
+class Ply:
+    """A player's complete move (turn), enough to redo it on the board before it"""
+    player: int
+    path: tuple[tuple[int, int], ...]  # squares visited by the piece: origin, then each step/jump destination
+    captured: tuple[tuple[int, int], ...] = ()
+    piece: int = PieceType.EMPTY_DARK  # piece (value) on the last square, i.e. crowned if it reached the last row
+
+    def apply(self, val_arr: np.ndarray):
+        val_arr[self.path[0]] = PieceType.EMPTY_DARK
+        for enemy_rc in self.captured:
+            val_arr[enemy_rc] = PieceType.EMPTY_DARK
+        val_arr[self.path[-1]] = self.piece
+
+
 @dataclass
 class GameRound:
     state: 'GameState' = field(init=False)
@@ -20,8 +36,11 @@ class GameRound:
     players: Iterable[int] = Owner
     current_player: int = Owner.P1  # change starting player
     view_update_signals: list[bool] = field(default_factory=list)  # alt. True/False
+    history: list[Ply] = field(default_factory=list)  # moves made since initial_board
+    initial_board: np.ndarray = field(init=False)
 
     def __post_init__(self):
+        self.initial_board = self.board.val_arr.copy()
         self.players = cycle(self.players)
 
         if self.current_player not in self.players:
@@ -33,6 +52,7 @@ class GameRound:
 
         self.state = SelectingPiece(context=self)
 
+    @metrics.timed('game_action')
     def action(self, square_rowcol: tuple[int, int]) -> list[bool]:
         self.state = self.state.action(square_rowcol=square_rowcol)
         return self.view_update_signals
@@ -41,14 +61,21 @@ class GameRound:
         self.current_player = next(self.players)
         return self.current_player
 
+    def between_moves(self) -> bool:
+        """No piece selected nor move in progress: game is fully described by board and current player"""
+        return isinstance(self.state, SelectingPiece) and self.state.selection_piece_rc is None
+
     def declare_winner(self, player: int):
         self.over = player  # game over and winner
         self.current_player = PieceType.crown(player)
 
+    @metrics.timed('boardview_aslist')
     def boardview_aslist(self) -> list[list[int]]:
         """in each row, each column value as int (not np.int) for JS + optional selection 'overlay'"""
-        return [ [int(v) if (r, col) != self.state.selection_piece_rc else PieceType.select(v)
-                  for col, v in enumerate(rowvals)] for r, rowvals in enumerate(self.board.val_arr) ]
+        rows = self.board.val_arr.tolist()  # C loop, python ints
+        if (rc := self.state.selection_piece_rc) is not None:
+            rows[rc[0]][rc[1]] = int(PieceType.select(rows[rc[0]][rc[1]]))
+        return rows
 
 
 @dataclass
@@ -86,23 +113,23 @@ class GameState(ABC):
 
     def _handle_non_king_moves(self, piece_val: int, piece_rc: tuple[int, int], jump_only: bool,
                                enemies_already_jumped_over: Container[tuple[int, int]]):
-        enemy_man_king = PieceType.get_enemy_pieces(self.context.current_player)
-        nearbies = self.context.board.get_diags_neighbors(piece_rc)
-        enemies_nearby = {rc for rc in nearbies if (self.context.board[rc] in enemy_man_king) and
+        enemy_man_king = ENEMY_PIECES[self.context.current_player]
+        board = self.context.board
+        nearbies = board.get_diags_neighbors(piece_rc)
+        enemies_nearby = {rc for rc in nearbies if (board.val_arr.item(rc) in enemy_man_king) and
                           (rc not in enemies_already_jumped_over)}
 
         if not jump_only:
             fronts = Board.filter_frontal_squares(origin=piece_rc, destinations=nearbies,
                                                   player=self.context.current_player)
-            empty_fronts = {rc for rc in fronts if self.context.board[rc] == PieceType.EMPTY_DARK}
+            empty_fronts = {rc for rc in fronts if board.val_arr.item(rc) == PieceType.EMPTY_DARK}
             self.allowed_destinations.update(empty_fronts)
 
         for enemy_rc in enemies_nearby:
             _jump_dir = enemy_rc[0] - piece_rc[0], enemy_rc[1] - piece_rc[1]
             jump_sq = enemy_rc[0] + _jump_dir[0], enemy_rc[1] + _jump_dir[1]
 
-            if jump_sq in self.context.board.set_rc_coordinates and \
-                    self.context.board[jump_sq] == PieceType.EMPTY_DARK:
+            if board.on_grid(jump_sq) and board.val_arr.item(jump_sq) == PieceType.EMPTY_DARK:
                 if not jump_only:
                     self.allowed_moves(jump_only=True, piece_val=piece_val, piece_rc=piece_rc)
                     return
@@ -112,18 +139,21 @@ class GameState(ABC):
     def _handle_king_moves(self, piece_val: int, piece_rc: tuple[int, int], jump_only: bool,
                            enemies_already_jumped_over: Container[tuple[int, int]]):
         dirs = Board.get_directions()
-        enemy_man_king = PieceType.get_enemy_pieces(self.context.current_player)
-    
+        player = self.context.current_player
+        enemy_man_king = ENEMY_PIECES[player]
+        board_is_out_of_board_or_own_piece = self.context.board.is_out_of_board_or_own_piece  # hot loop: local names
+        square_value = self.context.board.val_arr.item
+
         for dr, dc in dirs:
             ri, ci = r, c = piece_rc
             enemies_this_direction = set()
             enemy_encountered_last = False
-    
-            while True:  # traversing one of 4 directions
+
+            while True:  # traversing one of 4 directions (long rays on large boards)
                 new_rc = ri, ci = ri + dr, ci + dc
-                if self.context.board.is_out_of_board_or_own_piece(new_rc, self.context.current_player):
+                if board_is_out_of_board_or_own_piece(new_rc, player):
                     break
-                elif self.context.board[new_rc] in enemy_man_king:
+                elif square_value(new_rc) in enemy_man_king:
                     if enemy_encountered_last or new_rc in enemies_already_jumped_over:
                         break  # second enemy piece in a row or already jumped over piece
                     enemy_encountered_last = True
@@ -161,6 +191,7 @@ class SelectingPiece(GameState):
                               ).action(square_rowcol=square_rowcol)
         return self  # pass with creation immutable self.selection_piece_value, self.selection_piece_rc?
 
+    @metrics.timed('player_attacking_pieces')
     def player_attacking_pieces(self) -> set[tuple[int, int]]:
         threatening = set()
         own_pieces_coords = self.context.board.get_coords_for_all_own_pieces(self.context.current_player)
@@ -175,9 +206,11 @@ class SelectingPiece(GameState):
 class MakingMove(GameState):
     enemies_to_remove: set = field(default_factory=set)  # restrict 2nd and further moves (removed after a complete move)
     restricted_selection: bool = False
+    path: list[tuple[int, int]] = field(default_factory=list)  # squares visited so far (for GameRound.history)
     allowed_destinations: set = field(init=False)
     enemies_encountered: defaultdict = field(init=False)
 
+    @metrics.timed('allowed_moves')  # not on allowed_moves itself, as it recurses when a jump is found
     def __post_init__(self):
         self.allowed_moves(piece_val=self.selection_piece_value, piece_rc=self.selection_piece_rc)
         super().__post_init__()
@@ -193,6 +226,7 @@ class MakingMove(GameState):
                               selection_piece_value=self.selection_piece_value,
                               ).action(square_rowcol=square_rowcol)  # process new selection
 
+    @metrics.timed('can_move')
     def _can_move(self, player: int) -> bool:
         own_pieces_coords = self.context.board.get_coords_for_all_own_pieces(self.context.current_player)
         for rowcol in own_pieces_coords:
@@ -207,6 +241,9 @@ class MakingMove(GameState):
 
     def make_move(self, to: tuple[int, int]):
         piece_val, piece_rc = self.selection_piece_value, self.selection_piece_rc  # piece's type+player and rowcol coords
+        if not self.path:
+            self.path.append(piece_rc)
+        self.path.append(to)
         if self.piece_reaches_last_row(at=to) and not PieceType.is_king(piece_val):
             piece_val = self.context.board[piece_rc] = PieceType.crown(piece_val)  # promotes piece
         self.context.board[piece_rc] = PieceType.EMPTY_DARK  # moving from
@@ -223,7 +260,10 @@ class MakingMove(GameState):
         return self.finish_move()
 
     def finish_move(self):
+        metrics.count('moves')
         old_player = self.context.current_player
+        self.context.history.append(Ply(player=old_player, path=tuple(self.path),
+                                        captured=tuple(self.enemies_to_remove), piece=int(self.selection_piece_value)))
         new_player = self.context.switch_current_player()
         if self.enemies_to_remove:
             self.context.board.remove_enemies(self.enemies_to_remove)
@@ -1,14 +1,25 @@
 import numpy as np
 from string import ascii_uppercase
 from itertools import product
+from functools import cached_property
 from enum import IntEnum, Enum  # StrEnum since Python 3.11
 
 
 class Grid:
     def __init__(self, w: int, h: int):
         self.dims = self.h, self.w = h, w
-        self.rc_coordinates = self.generate_coords(w, h)  # rc is rowcol
-        self.set_rc_coordinates = {c for c in self.rc_coordinates.ravel()}
+
+    @cached_property
+    def rc_coordinates(self) -> np.ndarray:  # rc is rowcol; O(h*w) tuples, so only built if used (e.g. by a view)
+        return self.generate_coords(self.w, self.h)
+
+    @cached_property
+    def set_rc_coordinates(self) -> set[tuple[int, int]]:
+        return {c for c in self.rc_coordinates.ravel()}
+
+    def on_grid(self, rc: tuple[int, int]) -> bool:
+        """Same as rc in set_rc_coordinates, without materializing the coordinates"""
+        return 0 <= rc[0] < self.h and 0 <= rc[1] < self.w
 
     @staticmethod
     def generate_coords(w: int, h: int, convention: str = 'numpy') -> np.ndarray:
@@ -35,11 +46,8 @@ class Board(Grid):
     def __init__(self, w: int = 8, h: int = 8, test_board: np.ndarray | None = None):
         if test_board is None:
             super().__init__(w=w, h=h)
-            filled = np.full(self.dims, fill_value=PieceType.EMPTY_LIGHT)
-
-            for c in self.rc_coordinates.flatten():
-                if sum(c) % 2:  # every second (vertically, horizontally) square is dark (val_arr):
-                    filled[c] = PieceType.EMPTY_DARK
+            rows, cols = np.indices(self.dims)  # every second (vertically, horizontally) square is dark (val_arr):
+            filled = np.where((rows + cols) % 2, PieceType.EMPTY_DARK, PieceType.EMPTY_LIGHT).astype(np.int8)
 
             self.val_arr = self.complete_init_placement(checkerboard=filled)
         else:
@@ -83,18 +91,20 @@ class Board(Grid):
         for enemy_rc in enemies_to_remove:
             self.val_arr[enemy_rc] = PieceType.EMPTY_DARK
 
-    def get_coords_for_all_own_pieces(self, player: int) -> set[tuple[int, int]]:
-        return self.rc_coordinates[np.isin(self.val_arr, PieceType.get_owner_pieces(player))]
+    def owned_mask(self, player: int) -> np.ndarray:
+        return OWNER_LOOKUP[player][self.val_arr]  # vectorized like np.isin, without sorting
+
+    def get_coords_for_all_own_pieces(self, player: int) -> list[tuple[int, int]]:
+        return [(r, c) for r, c in np.argwhere(self.owned_mask(player)).tolist()]
 
     def any_pieces_left(self, player: int) -> bool:
-        return np.isin(self.val_arr, PieceType.get_owner_pieces(player)).any()  # victory check (any enemies)
+        return self.owned_mask(player).any()  # victory check (any enemies)
 
     def is_out_of_board_or_own_piece(self, new_rc: tuple[int, int], current_player: int) -> bool:
-        return new_rc not in self.set_rc_coordinates or \
-               self.val_arr[new_rc] in PieceType.get_owner_pieces(current_player)
+        return not self.on_grid(new_rc) or self.val_arr.item(new_rc) in OWNER_PIECES[current_player]
 
     def get_diags_neighbors(self, coord: tuple[int, int]) -> set[tuple[int, int]]:
-        neighbors00 = self.get_directions()  # row=0, col=0
+        neighbors00 = DIAGONALS  # row=0, col=0
         neighbors_of_coord = {(r + coord[0], c + coord[1]) for (r, c) in neighbors00}  # offsets
         valid_neighbors_of_coord = {(r, c) for (r, c) in neighbors_of_coord if
                                     (0 <= c < self.w and 0 <= r < self.h)}
@@ -102,7 +112,7 @@ class Board(Grid):
 
     @staticmethod
     def get_directions():  # can only move diagonally (4 pairs with -1 or 1)
-        return product({-1, 1}, repeat=2)
+        return iter(DIAGONALS)
 
     @staticmethod
     def filter_frontal_squares(origin: tuple[int, int], destinations: set[tuple[int, int]], player: int
@@ -159,6 +169,15 @@ class PieceType(IntEnum):
             return [cls.P1, cls.P1C]
 
 
+DIAGONALS = tuple(product((-1, 1), repeat=2))
+# hot path lookups (plain ints, hashable sets / boolean table indexed [player, square value]):
+OWNER_PIECES = {owner: frozenset(map(int, PieceType.get_owner_pieces(owner))) for owner in Owner}
+ENEMY_PIECES = {owner: frozenset(map(int, PieceType.get_enemy_pieces(owner))) for owner in Owner}
+OWNER_LOOKUP = np.zeros((max(Owner) + 1, max(PieceType) + 1), dtype=bool)
+for _owner, _pieces in OWNER_PIECES.items():
+    OWNER_LOOKUP[_owner, list(_pieces)] = True
+
+
 class PieceChar(str, Enum):
     EMPTY_LIGHT = '\u25AE'  # ordering wrt. PieceType doesn't matter with .all_sorted() method
     EMPTY_DARK = ' '
@@ -0,0 +1,38 @@
+import threading
+from model.engine import GameRound
+from model.gridlike import Board
+
+
+class Replay:
+    """
+    Board at any ply (number of moves made) of a game: a copy of the board is kept as keyframe every
+     keyframe_interval plies, so a seek copies the nearest keyframe and re-applies fewer than keyframe_interval moves.
+    Keyframes are added as the (possibly still running) game's history grows.
+    """
+
+    def __init__(self, game: GameRound, keyframe_interval: int = 16):
+        self.game, self.keyframe_interval = game, keyframe_interval
+        self.keyframes = [game.initial_board.copy()]  # keyframes[i] is the board at ply i * keyframe_interval
+        self._lock = threading.Lock()  # seeks may come from several server threads
+
+    @property
+    def plies(self) -> int:
+        return len(self.game.history)
+
+    def _add_keyframes(self, up_to_ply: int):
+        with self._lock:
+            while (ply := len(self.keyframes) * self.keyframe_interval) <= up_to_ply:
+                val_arr = self.keyframes[-1].copy()
+                for move in self.game.history[ply - self.keyframe_interval:ply]:
+                    move.apply(val_arr)
+                self.keyframes.append(val_arr)
+
+    def board_at(self, ply: int) -> Board:
+        if not 0 <= ply <= self.plies:
+            raise IndexError(f"Ply {ply} is not in 0..{self.plies}")
+        self._add_keyframes(up_to_ply=ply)
+        keyframe = ply // self.keyframe_interval
+        val_arr = self.keyframes[keyframe].copy()
+        for move in self.game.history[keyframe * self.keyframe_interval:ply]:
+            move.apply(val_arr)
+        return Board(test_board=val_arr)
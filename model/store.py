@@ -0,0 +1,201 @@
+import logging
+import sqlite3
+import threading
+import numpy as np
+from queue import Queue, Empty
+from time import monotonic, sleep
+from model.engine import GameRound, Ply
+from model.gridlike import Board, Owner
+
+log = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (id INTEGER PRIMARY KEY, winner INTEGER NOT NULL DEFAULT 0);
+CREATE TABLE IF NOT EXISTS snapshots (game_id INTEGER NOT NULL, seq INTEGER NOT NULL, current_player INTEGER NOT NULL,
+                                      h INTEGER NOT NULL, w INTEGER NOT NULL, board BLOB NOT NULL,
+                                      PRIMARY KEY (game_id, seq));
+CREATE TABLE IF NOT EXISTS clicks (game_id INTEGER NOT NULL, seq INTEGER NOT NULL, r INTEGER NOT NULL,
+                                   c INTEGER NOT NULL, PRIMARY KEY (game_id, seq));
+CREATE TABLE IF NOT EXISTS plies (game_id INTEGER NOT NULL, ply INTEGER NOT NULL, seq INTEGER NOT NULL,
+                                  player INTEGER NOT NULL, path BLOB NOT NULL, captured BLOB NOT NULL,
+                                  piece INTEGER NOT NULL, PRIMARY KEY (game_id, ply));
+"""
+
+
+class GameStore:
+    """
+    Durable games in SQLite (WAL mode): every click (square input) is appended to a log, and between moves the
+     board is snapshot every snapshot_every clicks (older log entries are then compacted away). Writes are queued
+     and group-committed by a writer thread (a transaction per commit_interval), off the game loop.
+    Each move (GameRound.history) is kept in a separate log, not compacted, together with the initial snapshot.
+    A game is restored from its latest snapshot by replaying the clicks logged after it through GameRound.action,
+     its history from the initial board and the moves logged until that snapshot (so all of it can be replayed).
+    A failed commit (after retries if the database is locked) is raised by the next record, flush or close, and
+     the writes queued after it are dropped: the log keeps no clicks after a lost one (restored as an earlier game).
+    """
+    commit_retries = 3
+
+    def __init__(self, path: str = 'checkers.db', snapshot_every: int = 50, commit_interval: float = 0.05):
+        self.path, self.snapshot_every, self.commit_interval = path, snapshot_every, commit_interval
+        self.seq, self.snapshot_seq = {}, {}  # per game_id: clicks logged so far, and at the latest snapshot
+        self.plies = {}  # per game_id: moves logged so far
+        self.error = None  # first exception of the writer thread, writes are no longer durable
+        self.error_raised = False  # to the game loop already (not again by close)
+        self.db = self._connect()
+        self.db.executescript(SCHEMA)  # before the writer connects
+        self._queue = Queue()
+        self._writer = threading.Thread(target=self._write_batches, name='game-store-writer', daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")  # committed transactions survive process crash (WAL fsync'd later)
+        return db
+
+    def new_game(self, game: GameRound) -> int:
+        with self.db:  # committed right away, together with the initial snapshot
+            game_id = self.db.execute("INSERT INTO games DEFAULT VALUES").lastrowid
+            self.seq[game_id] = self.snapshot_seq[game_id] = self.plies[game_id] = 0
+            self.db.execute(*self._snapshot_insert(game_id, game))
+        return game_id
+
+    def record(self, game_id: int, square_rowcol: tuple[int, int], game: GameRound):
+        """Logs a click after GameRound.action processed it (and the game's snapshot/result if due)"""
+        self._check_writer()
+        seq = self.seq[game_id] = self.seq[game_id] + 1
+        self._queue.put(("INSERT INTO clicks VALUES (?, ?, ?, ?)", (game_id, seq, *map(int, square_rowcol))))
+        self._queue_plies(game_id, game)
+        if game.over:
+            self._queue.put(("UPDATE games SET winner = ? WHERE id = ?", (int(game.over), game_id)))
+        elif seq - self.snapshot_seq[game_id] >= self.snapshot_every and game.between_moves():
+            self.snapshot(game_id, game)
+
+    def _queue_plies(self, game_id: int, game: GameRound):
+        """Logs moves of the game's history not logged yet, as completed by the latest click"""
+        for ply in range(self.plies[game_id], len(game.history)):
+            move = game.history[ply]
+            self._queue.put(("INSERT OR REPLACE INTO plies VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             (game_id, ply, self.seq[game_id], int(move.player), squares_blob(move.path),
+                              squares_blob(move.captured), int(move.piece))))
+        self.plies[game_id] = len(game.history)
+
+    def _snapshot_insert(self, game_id: int, game: GameRound) -> tuple[str, tuple]:
+        board = game.board.val_arr.astype(np.int8)  # a copy, as of now
+        return ("INSERT INTO snapshots VALUES (?, ?, ?, ?, ?, ?)",
+                (game_id, self.seq[game_id], int(game.current_player), *board.shape, board.tobytes()))
+
+    def snapshot(self, game_id: int, game: GameRound):
+        seq = self.snapshot_seq[game_id] = self.seq[game_id]
+        self._queue.put(self._snapshot_insert(game_id, game))
+        self._queue.put(("DELETE FROM snapshots WHERE game_id = ? AND seq > 0 AND seq < ?",  # compaction, the
+                         (game_id, seq)))  # initial board is kept for replay
+        self._queue.put(("DELETE FROM clicks WHERE game_id = ? AND seq <= ?", (game_id, seq)))
+
+    def restore_active(self) -> tuple[int, GameRound] | None:
+        """Latest game without a winner, rebuilt from its snapshot and the clicks after it (with its whole history)"""
+        row = self.db.execute("SELECT id FROM games WHERE winner = 0 ORDER BY id DESC LIMIT 1").fetchone()
+        if row is None:
+            return None
+        game_id, = row
+        snapshots = self.db.execute("SELECT seq, current_player, h, w, board FROM snapshots WHERE game_id = ? "
+                                    "AND seq IN (0, (SELECT MAX(seq) FROM snapshots WHERE game_id = ?)) ORDER BY seq",
+                                    (game_id, game_id)).fetchall()
+        (_, _, h0, w0, initial_blob), (seq, player, h, w, blob) = snapshots[0], snapshots[-1]
+        board = Board(test_board=np.frombuffer(blob, dtype=np.int8).reshape(h, w).copy())
+        game = GameRound(board=board, current_player=Owner(player))
+        game.initial_board = np.frombuffer(initial_blob, dtype=np.int8).reshape(h0, w0).copy()
+        game.history = self._logged_plies(game_id, up_to_seq=seq)  # the moves after the snapshot are redone below
+        self.seq[game_id] = self.snapshot_seq[game_id] = seq
+        self.plies[game_id] = len(game.history)
+        for seq, r, c in self.db.execute("SELECT seq, r, c FROM clicks WHERE game_id = ? AND seq > ? ORDER BY seq",
+                                         (game_id, seq)):
+            game.action(square_rowcol=(r, c))
+            self.seq[game_id] = seq
+            self._queue_plies(game_id, game)  # (re)logged, in case the crash came before they were committed
+        game.view_update_signals.clear()
+        return game_id, game
+
+    def _logged_plies(self, game_id: int, up_to_seq: int) -> list[Ply]:
+        return [Ply(player=Owner(player), path=blob_squares(path), captured=blob_squares(captured), piece=piece)
+                for player, path, captured, piece in self.db.execute(
+                    "SELECT player, path, captured, piece FROM plies WHERE game_id = ? AND seq <= ? ORDER BY ply",
+                    (game_id, up_to_seq))]
+
+    def _write_batches(self):
+        db = self._connect()  # writer's own connection (self.db is used from the game loop thread)
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            deadline = monotonic() + self.commit_interval  # group commit: collect writes until then
+            while (timeout := deadline - monotonic()) > 0:
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except Empty:
+                    break
+            if self.error is None:  # else dropped, a click after a lost one would restore a different game
+                self._commit(db, [item for item in batch if isinstance(item, tuple)])
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()  # flushed
+                stop = stop or item is None
+        db.close()
+
+    def _commit(self, db: sqlite3.Connection, writes: list[tuple[str, tuple]]):
+        for attempt in range(self.commit_retries + 1):
+            try:
+                with db:  # one transaction, rolled back on error
+                    for write in writes:
+                        db.execute(*write)
+                return
+            except sqlite3.OperationalError as e:  # e.g. database is locked (busy timeout passed)
+                if attempt < self.commit_retries:
+                    log.warning("Game store commit failed (%s), retrying", e)
+                    sleep(self.commit_interval * 2 ** attempt)
+                    continue
+                self._fail(e)
+            except Exception as e:  # e.g. IntegrityError: same game resumed by another process
+                self._fail(e)
+            return
+
+    def _fail(self, e: Exception):
+        log.error("Game store commit failed, %s", e)
+        if self.error is None:
+            self.error = e
+
+    def _raise_error(self):
+        self.error_raised = True
+        raise RuntimeError(f"Game store {self.path} failed to commit writes") from self.error
+
+    def _check_writer(self):
+        if self.error is not None:
+            self._raise_error()
+        if not self._writer.is_alive():
+            raise RuntimeError(f"Game store {self.path} writer thread is not running")
+
+    def flush(self, timeout: float = 30.):
+        """Blocks until everything recorded so far is committed"""
+        self._check_writer()
+        flushed = threading.Event()
+        self._queue.put(flushed)
+        deadline = monotonic() + timeout
+        while not flushed.wait(timeout=0.1):
+            if not self._writer.is_alive() or monotonic() > deadline:
+                raise RuntimeError(f"Game store {self.path} writes were not committed (in {timeout} s)")
+        self._check_writer()
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        self.db.close()
+        if self.error is not None and not self.error_raised:
+            self._raise_error()
+
+
+def squares_blob(squares: tuple[tuple[int, int], ...]) -> bytes:
+    return np.array(squares, dtype=np.int16).tobytes()  # (row, col) pairs
+
+
+def blob_squares(blob: bytes) -> tuple[tuple[int, int], ...]:
+    return tuple(map(tuple, np.frombuffer(blob, dtype=np.int16).reshape(-1, 2).tolist()))
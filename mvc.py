@@ -1,5 +1,7 @@
-from view.web import run_local_webserver
+from view import get_ux
 from model.engine import GameRound
+from model.store import GameStore
+from instrumentation import metrics, profiled
 from typing import Callable
 from time import sleep
 import sys
@@ -8,8 +10,16 @@ import sys
 class CheckersController:
 
     def __init__(self, game_settings: dict | None = None, game_model: 'GameRound' = GameRound,
-                 ux: 'View' | Callable = run_local_webserver):
-        self.game_model = game_model() if game_settings is None else game_model(**game_settings)
+                 ux: 'View' | Callable | str = 'web', game_store: GameStore | None = None):
+        self.game_store, self.game_id = game_store, None
+        if game_store is not None and game_settings is None and (restored := game_store.restore_active()):
+            self.game_id, self.game_model = restored  # continue the game interrupted by a crash or restart
+        else:
+            self.game_model = game_model() if game_settings is None else game_model(**game_settings)
+            if game_store is not None:
+                self.game_id = game_store.new_game(self.game_model)
+        if isinstance(ux, str):  # UI backend name, see view.UX_BACKENDS
+            ux = get_ux(ux)
         ux_server = ux(board_info=self.game_model)  # View and User inputs
         self.server, self.server_thread, self.ux_state = ux_server
         self.player_clicks = self.ux_state.moves
@@ -19,30 +29,45 @@ class CheckersController:
         game = self.game_model
         self.ux_state.update_board(game)
         get_action = self.get_user_click if bot_strategy is None else self._feed(bot_strategy)
+        metrics.start_periodic_log()
+        try:
+            with profiled():
+                self._game_loop(game, get_action)
+        finally:
+            if self.game_store is not None:
+                self.game_store.close()  # commits pending writes
+
+        self.ux_state.show_winner(game.over)  # show winner top-left
+        return
 
+    def _game_loop(self, game: 'GameRound', get_action: Callable):
         while not game.over:  # make a generator loop?
             try:
                 input_action = get_action()
                 if square_rowcol := input_action:
                     ui_updates = game.action(square_rowcol=square_rowcol)
+                    if self.game_store is not None:
+                        self.game_store.record(self.game_id, square_rowcol, game)  # queued, committed in background
                     if (ui_updates and ui_updates.pop()) or self.server is None:
                         self.ux_state.update_board(game)
             except KeyboardInterrupt:
                 print("Shutting down server...")
-                self.server.should_exit = True
-                self.server_thread.join()
+                self._shutdown_server()
                 print("Server shut down. Killing PID")
                 sys.exit(4)
             except Exception as e:
                 import traceback
-                self.server.should_exit = True
-                self.server_thread.join()
+                self._shutdown_server()
                 print(f"An error occurred: {e}")
                 traceback.print_exc()
                 sys.exit(4)
 
-        self.ux_state.show_winner(game.over)  # show winner top-left
-        return
+    def _shutdown_server(self):
+        if self.server is None:  # e.g. CLI or Excel UI
+            return
+        self.ux_state.close()  # ends /spectate streams, which would otherwise keep the server running
+        self.server.should_exit = True
+        self.server_thread.join()
 
     def _feed(self, bot_strategy: Callable) -> Callable:
         pass
@@ -0,0 +1,95 @@
+import threading
+from time import sleep
+
+import pytest
+
+from model.engine import GameRound
+from model.replay import Replay
+from model.store import GameStore
+
+# an opening of 12 moves (incl. captures), from the initial board
+CLICKS = [(5, 6), (4, 7), (2, 1), (3, 2), (6, 5), (5, 6), (2, 5), (3, 6), (4, 7), (2, 5), (1, 4), (3, 6),
+          (5, 4), (4, 3), (3, 2), (5, 4), (6, 3), (4, 5), (3, 6), (5, 4), (7, 6), (6, 5), (5, 4), (7, 6)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = GameStore(str(tmp_path / 'test.db'), commit_interval=0.01)
+    yield store
+    store.error = None  # failures are asserted by the tests
+    store.close()
+
+
+def test_failed_commit_is_raised(store):
+    game = GameRound()
+    game_id = store.new_game(game)
+    with store.db:
+        store.db.execute("INSERT INTO clicks VALUES (?, 1, 0, 0)", (game_id,))  # e.g. by another process
+    store.record(game_id, (5, 0), game)
+    with pytest.raises(RuntimeError, match='failed to commit'):
+        store.flush()
+    with pytest.raises(RuntimeError, match='failed to commit'):
+        store.record(game_id, (4, 1), game)
+
+
+def test_no_writes_after_failed_commit(store):
+    game = GameRound()
+    game_id = store.new_game(game)
+    with store.db:
+        store.db.execute("INSERT INTO clicks VALUES (?, 1, 0, 0)", (game_id,))  # first click's commit fails
+    commit, release = store._commit, threading.Event()
+
+    def delayed_commit(db, writes):  # e.g. retrying while the database is locked
+        release.wait(timeout=5)
+        commit(db, writes)
+
+    store._commit = delayed_commit
+    for i, click in enumerate(CLICKS[:4]):
+        game.action(square_rowcol=click)
+        store.record(game_id, click, game)
+        if i == 0:
+            sleep(0.05)  # later clicks are queued while the first batch is being committed
+    release.set()
+    with pytest.raises(RuntimeError, match='failed to commit'):
+        store.flush()
+    assert store.db.execute("SELECT seq FROM clicks WHERE game_id = ?", (game_id,)).fetchall() == [(1,)]
+    assert store.db.execute("SELECT COUNT(*) FROM plies WHERE game_id = ?", (game_id,)).fetchone() == (0,)
+
+
+def test_close_does_not_raise_reported_error(store):
+    game = GameRound()
+    game_id = store.new_game(game)
+    with store.db:
+        store.db.execute("INSERT INTO clicks VALUES (?, 1, 0, 0)", (game_id,))
+    store.record(game_id, CLICKS[0], game)
+    with pytest.raises(RuntimeError, match='failed to commit'):
+        store.flush()
+    store.close()  # e.g. in start_game's finally, after the game loop exited on the error
+
+
+def test_flush_fails_without_writer(store):
+    store._queue.put(None)
+    store._writer.join()
+    with pytest.raises(RuntimeError, match='not running'):
+        store.flush()
+
+
+def test_restore_keeps_history_for_replay(tmp_path):
+    path = str(tmp_path / 'test.db')
+    store = GameStore(path, snapshot_every=10)
+    game = GameRound()
+    game_id = store.new_game(game)
+    for click in CLICKS[:-1]:  # unfinished game
+        game.action(square_rowcol=click)
+        store.record(game_id, click, game)
+    store.close()
+
+    store = GameStore(path)
+    restored_id, restored = store.restore_active()
+    assert store.snapshot_seq[game_id] > 0  # clicks before it were compacted away
+    assert restored_id == game_id and restored.history == game.history
+    assert (restored.initial_board == game.initial_board).all()
+    replay, restored_replay = Replay(game), Replay(restored)
+    for ply in range(len(game.history) + 1):
+        assert (restored_replay.board_at(ply).val_arr == replay.board_at(ply).val_arr).all()
+    store.close()
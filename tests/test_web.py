@@ -0,0 +1,35 @@
+import asyncio
+
+from view.web import SnapshotBroadcast
+
+
+def test_close_ends_subscriptions():
+    async def spectate_until_closed():
+        broadcast = SnapshotBroadcast()
+        broadcast.publish(b'first')
+        frames = []
+
+        async def subscriber():
+            async for frame in broadcast.subscribe():
+                frames.append(frame)
+
+        task = asyncio.create_task(subscriber())
+        await asyncio.sleep(0)  # receives the current frame, then waits for the next one
+        broadcast.close()
+        await asyncio.wait_for(task, timeout=1)
+        return frames, broadcast.subscribers
+
+    assert asyncio.run(spectate_until_closed()) == ([b'first'], 0)
+
+
+def test_publish_after_event_loop_closed():
+    broadcast = SnapshotBroadcast()
+    broadcast.publish(b'first')
+
+    async def spectate_once():
+        async for _ in broadcast.subscribe():
+            return  # binds the broadcast to this event loop
+
+    asyncio.run(spectate_once())
+    broadcast.publish(b'next')  # e.g. a move after the server stopped
+    assert broadcast.frame == b'next'
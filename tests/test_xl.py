@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+import view.xl
+from model.engine import GameRound
+from model.gridlike import Board, PieceType
+from view.xl import CheckersExcel, MemorySheet
+
+
+@pytest.fixture(autouse=True)
+def no_polling_delay(monkeypatch):
+    monkeypatch.setattr(view.xl, 'sleep', lambda seconds: None)
+
+
+def drawn_view(game: GameRound) -> tuple[CheckersExcel, MemorySheet]:
+    sheet = MemorySheet()
+    view_ = CheckersExcel(game, sheet=sheet)
+    view_.put_all_content_on_grid()
+    return view_, sheet
+
+
+def test_first_draw_is_one_grid_write():
+    game = GameRound()
+    view_, sheet = drawn_view(game)
+    assert sheet.writes == 1
+    assert sheet.read_grid() == view_.grid_values()
+    assert len(sheet.cells) == game.board.h * game.board.w
+
+
+def test_move_writes_changed_cells_only():
+    game = GameRound()
+    view_, sheet = drawn_view(game)
+    game.action((5, 0))
+    game.action((4, 1))
+    view_.put_all_content_on_grid()
+    assert sheet.writes == 1 + 2  # from and to squares
+    assert sheet.read_grid() == view_.grid_values()
+
+
+def test_capture_writes_changed_cells_only():
+    E, L, P1, P2 = PieceType.EMPTY_DARK, PieceType.EMPTY_LIGHT, PieceType.P1, PieceType.P2
+    case = np.array([[L, E, L, E],
+                     [E, L, E, L],
+                     [L, P2, L, E],
+                     [P1, L, E, L]])
+    game = GameRound(board=Board(test_board=case))
+    view_, sheet = drawn_view(game)
+    game.action((3, 0))
+    game.action((1, 2))  # jumps over (2, 1)
+    view_.put_all_content_on_grid()
+    assert 1 + 3 == sheet.writes <= 1 + CheckersExcel.max_cell_writes
+    assert sheet.read_grid() == view_.grid_values()
+
+
+def test_single_typed_cell_is_the_move():
+    view_, sheet = drawn_view(GameRound())
+    sheet.cells[5, 2] = 'x'
+    assert view_.get_user_move() == (5, 2)
+
+
+def test_several_changed_cells_are_rolled_back():
+    view_, sheet = drawn_view(GameRound())
+    before = sheet.read_grid()
+    reads = []
+
+    def read_grid():
+        reads.append(None)
+        if len(reads) == 1:  # invalid input: two cells edited at once
+            sheet.cells[5, 2], sheet.cells[5, 4] = 'x', 'y'
+        elif len(reads) == 2:
+            assert sheet.read_grid_unpatched() == before  # rolled back before polling again
+            sheet.cells[4, 1] = 'x'
+        return sheet.read_grid_unpatched()
+
+    sheet.read_grid_unpatched, sheet.read_grid = sheet.read_grid, read_grid
+    assert view_.get_user_move() == (4, 1)
@@ -0,0 +1,20 @@
+"""UI backends resolved by name, so that only the selected one (and its dependencies) gets imported"""
+from importlib import import_module
+from typing import Callable
+
+UX_BACKENDS = {  # name: (module, attribute called with board_info=GameRound, returning (server, thread, view))
+    'web': ('view.web', 'run_local_webserver'),
+    'cli': ('view.cli_poc_only', 'CheckersCLI.use_as_ux'),
+    'xl': ('view.xl', 'CheckersExcel.use_as_ux'),  # needs MS Excel and pythonnet
+}
+
+
+def get_ux(name: str) -> Callable:
+    try:
+        module_name, attr_path = UX_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown UI backend {name!r}, expected one of {sorted(UX_BACKENDS)}") from None
+    ux = import_module(module_name)
+    for attr in attr_path.split('.'):
+        ux = getattr(ux, attr)
+    return ux
@@ -39,7 +39,7 @@ class CheckersCLI:
             sleep(0.1)  # poll user (not bot) "selection" every second
             if board_colrow_user_str:
                 rowcol = self.parse_chess_str_as_coord_rc(board_colrow_user_str)
-                if rowcol in self.board.set_rc_coordinates:
+                if self.board.on_grid(rowcol):
                     self.moves.append(CheckersCLI.rc_coords_named(*rowcol))
                     break
 
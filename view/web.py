@@ -1,27 +1,60 @@
+import asyncio
 from functools import partial
+from hashlib import blake2b
 from time import sleep
+from typing import AsyncIterator
 
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
+from instrumentation import metrics
+from model.replay import Replay
+
+try:
+    from orjson import dumps as json_dumps
+except ImportError:  # optional faster encoder
+    import json
+
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode()
+
 
 class FastAPIView:
-    def __init__(self, game_state):
+    def __init__(self, game_state, state_delay: float = 0.3):
         self.app = FastAPI()
         self.moves = game_state.moves
         self.board = game_state.board
         self.state = game_state
+        self.state_delay = state_delay
 
     def create_routes(self):
         # Mount the static directory to serve index.html and assets
         self.app.mount("/static", StaticFiles(directory="./view/static"), name="static")
 
         @self.app.get("/state")
-        def get_state():
-            sleep(0.3)  # longer sleep than in mvc.Checkers_Controller.get_user_move
-            return self.state
+        def get_state(request: Request):
+            sleep(self.state_delay)  # longer sleep than in mvc.Checkers_Controller.get_user_move
+            etag, snapshot = self.state.encoded  # pre-serialized, rebuilt only on board updates
+            headers = {"ETag": etag, "Cache-Control": "no-cache"}  # browser revalidates with If-None-Match
+            if request.headers.get("if-none-match") == etag:
+                return Response(status_code=304, headers=headers)
+            return Response(content=snapshot, media_type="application/json", headers=headers)
+
+        @self.app.get("/spectate")
+        async def spectate():  # read-only viewers: server-sent events, no polling
+            return StreamingResponse(self.state.spectators.subscribe(), media_type="text/event-stream",
+                                     headers={"Cache-Control": "no-cache"})
+
+        @self.app.get("/replay/{ply}")
+        def get_replay(ply: int):  # board after ply moves of this game (page: /?replay)
+            replay = self.state.replay
+            if replay is None or not 0 <= ply <= replay.plies:
+                raise HTTPException(status_code=404, detail=f"No ply {ply} in this game")
+            board = replay.board_at(ply).val_arr.tolist()
+            return Response(content=json_dumps({'ply': ply, 'plies': replay.plies, 'board': board}),
+                            media_type="application/json")
 
         @self.app.post("/move")
         def make_move(move: Move):
@@ -29,6 +62,10 @@ class FastAPIView:
                 self.moves.append(move)
                 return {"status": "success", "move": move}
 
+        @self.app.get("/metrics", response_class=PlainTextResponse)
+        def get_metrics():
+            return PlainTextResponse(metrics.prometheus_text(), media_type="text/plain; version=0.0.4")
+
         @self.app.get("/", response_class=HTMLResponse)
         async def read_index():
             with open("view/static/index.html") as f:
@@ -39,13 +76,18 @@ class FastAPIView:
         return self.app
 
 
-def run_server(board_info: 'GameRound', **kwargs):
-    game_state = Game(board_info.boardview_aslist())
-    fastapi_view = FastAPIView(game_state)
+def create_app(game_state: 'Game', **view_kwargs) -> FastAPI:
+    """App factory, e.g. for uvicorn --factory or serving the view of a game without the controller loop"""
+    return FastAPIView(game_state, **view_kwargs).get_app()
+
+
+def run_server(board_info: 'GameRound', timeout_graceful_shutdown: int = 5, **kwargs):
+    game_state = Game(board_info.boardview_aslist(), replay=Replay(board_info))
     import uvicorn
     import threading
     import traceback
-    config = uvicorn.Config(fastapi_view.get_app(), **kwargs)
+    config = uvicorn.Config(create_app(game_state), timeout_graceful_shutdown=timeout_graceful_shutdown,
+                            **kwargs)  # shutdown then cancels requests still running (e.g. long-lived streams)
     server = uvicorn.Server(config)
 
     def _start_server():
@@ -69,13 +111,78 @@ class Move(BaseModel):
 
 
 class Game:
-    def __init__(self, board_info: list[list[int]]):
+    def __init__(self, board_info: list[list[int]], replay: Replay | None = None):
         self.board = board_info
+        self.replay = replay  # of the game's moves so far
         self.moves = []
         self.is_async = True
+        self.spectators = SnapshotBroadcast()
+        self.refresh()
 
     def update_board(self, updated_board: list[list[int]]):
         self.board = updated_board.boardview_aslist()  # get a list (not np.ndarray) consumable by JS
+        self.refresh()
 
     def show_winner(self, winner: int):
         self.board = [[winner]]  # re-use same grid object for display
+        self.refresh()
+
+    def close(self):
+        self.spectators.close()
+
+    def refresh(self):
+        self.encoded = etag, snapshot = self.encode()
+        self.spectators.publish(b'data: ' + snapshot + b'\n\n')  # one server-sent event for all spectators
+
+    @metrics.timed('state_json')
+    def encode(self) -> tuple[str, bytes]:
+        """JSON bytes served by /state and their ETag (swapped as one tuple, as read from server thread)"""
+        snapshot = json_dumps({'board': self.board, 'is_async': self.is_async})
+        return f'"{blake2b(snapshot, digest_size=8).hexdigest()}"', snapshot
+
+
+class SnapshotBroadcast:
+    """
+    Latest frame shared by any number of async subscribers (e.g. 10k idle spectators cost no CPU). Subscribers
+     slower than the updates skip ahead to the latest frame, nothing is buffered per subscriber.
+    """
+
+    def __init__(self):
+        self.frame, self.version = b'', 0
+        self.subscribers = 0
+        self.closed = False
+        self._loop = self._changed = None  # bound to the server's event loop by the first subscriber
+
+    def publish(self, frame: bytes):
+        """Thread-safe, called by the controller (game loop) thread"""
+        if self._loop is None or self._loop.is_closed():  # e.g. server stopped, the frame is just kept
+            self.frame, self.version = frame, self.version + 1
+        else:
+            self._loop.call_soon_threadsafe(self._publish, frame)
+
+    def close(self):
+        """Ends all subscriptions (thread-safe), else open streams keep the server from shutting down"""
+        self.closed = True
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._publish, self.frame)  # wakes subscribers to see closed
+
+    def _publish(self, frame: bytes):
+        self.frame, self.version = frame, self.version + 1
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()  # wakes all current subscribers at once
+
+    async def subscribe(self) -> AsyncIterator[bytes]:
+        if self._loop is None:
+            self._loop, self._changed = asyncio.get_running_loop(), asyncio.Event()
+        self.subscribers += 1
+        seen = 0
+        try:
+            while not self.closed:
+                if seen == self.version:
+                    await self._changed.wait()
+                    if self.closed:
+                        return
+                seen = self.version
+                yield self.frame  # the send of a slow consumer blocks here, and it misses intermediate versions
+        finally:
+            self.subscribers -= 1
@@ -1,34 +1,125 @@
 from model.engine import GameRound
-from model.gridlike import PieceChar, PieceType, Owner, Board
+from model.gridlike import PieceChar, PieceType, Owner
+from abc import ABC, abstractmethod
 from collections import namedtuple
 from time import sleep
 from functools import wraps
+from typing import Iterable
+import numpy as np
 
 import sys  # without this Excel complains of "Unlicensed product"
-import clr  # provide own path (may depend on your Excel installation):
-clr.AddReference(r"C:\Program Files (x86)\Microsoft Office\root\Office16\DCF\Microsoft.Office.Interop.Excel.dll")
-from System import Activator, Type, Reflection
-from Microsoft.Office.Interop import Excel
+
+# provide own path (may depend on your Excel installation):
+EXCEL_INTEROP_DLL = r"C:\Program Files (x86)\Microsoft Office\root\Office16\DCF\Microsoft.Office.Interop.Excel.dll"
+Activator = Type = Reflection = Array = Object = Excel = None  # .NET/Excel interop, loaded on first use (not at import)
+
+
+def load_interop(dll_path: str = EXCEL_INTEROP_DLL):
+    global Activator, Type, Reflection, Array, Object, Excel
+    if Excel is None:
+        import clr
+        clr.AddReference(dll_path)
+        from System import Activator, Type, Reflection, Array, Object
+        from Microsoft.Office.Interop import Excel
+
+
+class GridSheet(ABC):
+    """Spreadsheet operations CheckersExcel relies on: ExcelSheet (COM) or e.g. MemorySheet (to test on Linux)"""
+
+    @abstractmethod
+    def format_grid(self, h: int, w: int, dark_squares: Iterable[tuple[int, int]]):
+        pass
+
+    @abstractmethod
+    def read_grid(self) -> list[list]:
+        """Cell values (contents) of the grid range, row by row"""
+
+    @abstractmethod
+    def write_grid(self, values: list[list]):
+        """Sets all cell values of the grid range at once"""
+
+    @abstractmethod
+    def write_cell(self, rc: tuple[int, int], value: int | str):
+        pass
 
 
 class CheckersExcel:
     rc_coords_named = namedtuple('rowcol', ['r', 'c'])
+    max_cell_writes = 4  # changes up to this many squares (a move) are written cell by cell, else as whole grid
 
-    def __init__(self, board_info: GameRound):
-        self.start_rowcol, self.end_rowcol = (0, 0), (board_info.board.w-1, board_info.board.h-1)
-        self.y0, self.x0 = self.start_rowcol
-
+    def __init__(self, board_info: GameRound, sheet: GridSheet | None = None):
         self.game = board_info
-        self.board = board_info.board  # list of lists of ints
+        self.board = board_info.board
         self.moves = []  # user moves are appended here
 
+        self.sheet = ExcelSheet() if sheet is None else sheet
+        dark_squares = zip(*np.nonzero(self.board.val_arr != PieceType.EMPTY_LIGHT))  # checkerboard look
+        self.sheet.format_grid(*self.board.dims, dark_squares=dark_squares)
+        self.excel_grid = self.sheet.read_grid()  # cached cell values, as last written to or read from the sheet
+
+    @classmethod
+    def use_as_ux(cls, board_info: GameRound) -> tuple:
+        server = daemon_thread = None
+        instance_self = cls(board_info=board_info)
+        return server, daemon_thread, instance_self  # for compatibility with other UIs (e.g. async web servers)
+
+    def update_board(self, updated_board: GameRound):
+        self.put_all_content_on_grid()
+        if not self.game.over:  # get input from Excel:
+            rowcol = self.get_user_move()
+            self.moves.append(CheckersExcel.rc_coords_named(*rowcol))
+
+    def show_winner(self, winner: int):
+        below_board_1x1 = self.board.h, 0
+        self.sheet.write_cell(below_board_1x1, f"Winner {Owner(winner).name}: {PieceChar.get_char(winner)}")
+
+    def get_user_move(self) -> tuple[int, int] | None:
+        """Checks for and returns a valid user input (i.e. change in a cell on the grid/board range)"""
+        while not self.game.over:
+            sleep(0.5)  # poll user "move" every half-second
+            new_values = self.sheet.read_grid()  # use self.excel.ActiveCell and self.ws.OnEntry instead?
+            if new_values == self.excel_grid:
+                continue  # no changes: re-check for user input
+            changed = self.diff_grid(new_values)
+            if len(changed) == 1:
+                self.excel_grid = new_values  # user's entry is then overwritten by next put_all_content_on_grid
+                return changed[0]
+            self.sheet.write_grid(self.excel_grid)  # invalid input (e.g. multiple moves)
+
+    def diff_grid(self, values: list[list]) -> list[tuple[int, int]]:
+        """Coordinates of cells whose values differ from the cached grid"""
+        return [(r, c) for r, (cached_row, row) in enumerate(zip(self.excel_grid, values))
+                for c, (cached, value) in enumerate(zip(cached_row, row)) if cached != value]
+
+    def grid_values(self) -> list[list[str]]:
+        """Characters of the pieces on the board, blank for (light or dark) empty squares"""
+        is_piece = ~np.isin(self.board.val_arr, [PieceType.EMPTY_DARK, PieceType.EMPTY_LIGHT])
+        return np.where(is_piece, self.board.pretty, ' ').tolist()
+
+    def put_all_content_on_grid(self):
+        """Writes changed cells of the board to the sheet: one by one if few (a move), else all in one call"""
+        values = self.grid_values()
+        changed = self.diff_grid(values)
+        if len(changed) <= self.max_cell_writes:
+            for r, c in changed:
+                self.sheet.write_cell((r, c), values[r][c])
+        else:
+            self.sheet.write_grid(values)
+        self.excel_grid = values
+
+
+class ExcelSheet(GridSheet):
+    """Grid on the first worksheet of a new workbook in MS Excel, via .NET interop (pythonnet)"""
+
+    def __init__(self, start_rowcol: tuple[int, int] = (0, 0)):
+        self.y0, self.x0 = start_rowcol
+        self.h = self.w = 0
+        load_interop()
         excel_type = Type.GetTypeFromProgID("Excel.Application")
         self.excel = Activator.CreateInstance(excel_type)
         workbook = self.excel.Workbooks.Add()
         self.ws = Excel.Worksheet(workbook.Worksheets[1])
-        self.grid_range = self.excel_grid = None
-
-        self.format_grid(board_info.board)
+        self.grid_range = None
 
     @staticmethod
     def retry_on_errors(wrapped_f) -> callable:
@@ -49,55 +140,30 @@ class CheckersExcel:
             raise RuntimeError(f"Couldn't {wrapped_f} on Excel cell value")
         return wrapped
 
-    @classmethod
-    def use_as_ux(cls, board_info: GameRound) -> tuple:
-        server = daemon_thread = None
-        instance_self = cls(board_info=board_info)
-        return server, daemon_thread, instance_self  # for compatibility with other UIs (e.g. async web servers)
-
-    def update_board(self, updated_board: GameRound):
-        self.put_all_content_on_grid()
-        if not self.game.over:  # get input from Excel:
-            board_square_index = self.get_user_move()
-            rowcol = self.board.rc_coordinates.flatten()[board_square_index]
-            self.moves.append(CheckersExcel.rc_coords_named(*rowcol))
-
-    def show_winner(self, winner: int):
-        below_board_1x1 = self.get_xl_range(rc_coord=(self.end_rowcol[0] + 1, 0))
-        self.set_xl_value(below_board_1x1, f"Winner {Owner(winner).name}: {PieceChar.get_char(winner)}")
-
-    def get_user_move(self) -> int | None:
-        """Checks for and returns a valid user input (i.e. change in a cell on the grid/board range)"""
-        chgs, prior_values = 0, self.excel_grid  # contains state (cell values/contents) prior to user input
-        while not self.game.over:
-            sleep(0.5)  # poll user "move" every half-second
-            new_values = self.read_grid()  # use self.excel.ActiveCell and self.ws.OnEntry instead?
-            for i, (old_val, new_val) in enumerate(zip(prior_values, new_values)):
-                if old_val != new_val:
-                    chgs += 1
-                    changed_cell_idx, changed_cell_val = i, str(new_val)
-            if chgs:
-                if chgs == 1:
-                    return changed_cell_idx
-                else:
-                    self.set_grid(prior_values)  # invalid input (e.g. multiple moves)
-            # no changes: continue loop (re-check for user input)
-
     @retry_on_errors
-    def set_grid(self, values: "Value2"):
-        self.grid_range.Value2 = values
+    def write_grid(self, values: list[list]):
+        value2 = Array.CreateInstance(Object, self.h, self.w)  # 2D array: whole grid in a single COM call
+        for r, row in enumerate(values):
+            for c, value in enumerate(row):
+                value2.SetValue(value, r, c)
+        self.grid_range.Value2 = value2
+
+    def read_grid(self) -> list[list]:
+        flat = tuple(self.grid_range.Value2)  # element is a cell's content, row by row
+        return [list(flat[r * self.w:(r + 1) * self.w]) for r in range(self.h)]
 
-    def read_grid(self) -> tuple:
-        return tuple(self.grid_range.Value2)  # element is a cell's content
+    def write_cell(self, rc: tuple[int, int], value: int | str):
+        self.set_xl_value(self.get_xl_range(rc_coord=rc), value)
 
     @staticmethod
     def rgb_to_excel_color(r, g, b):
         """Converts RGB values to an Excel color integer."""
         return (b << 16) | (g << 8) | r
 
-    def format_grid(self, board: Board) -> "Value2":  # to-do: center value inside each cell
-        start_cell = self.get_xl_cell(*self.start_rowcol)  # ws.get_Cells or ws.Cells error
-        end_cell = self.get_xl_cell(*self.end_rowcol)
+    def format_grid(self, h: int, w: int, dark_squares: Iterable[tuple[int, int]]):  # to-do: center value in cell
+        self.h, self.w = h, w
+        start_cell = self.get_xl_cell(0, 0)  # ws.get_Cells or ws.Cells error
+        end_cell = self.get_xl_cell(h - 1, w - 1)
 
         self.grid_range = grid = self.get_xl_range(top_left=start_cell, bottom_right=end_cell)
         grid.set_ColumnWidth(2.14)  # default row height (20 px)
@@ -113,14 +179,12 @@ class CheckersExcel:
         grid.HorizontalAlignment = Excel.XlHAlign.xlHAlignCenter
         grid.VerticalAlignment = Excel.XlVAlign.xlVAlignCenter
 
-        for rc in board.set_rc_coordinates:
-            if board.val_arr[rc] != PieceType.EMPTY_LIGHT:  # checkerboard look (dark square if non-zero)
-                cell = self.get_xl_range(rc_coord=rc)
-                green_excel = self.rgb_to_excel_color(135, 186, 83)
-                cell.Interior.Color = green_excel  # to-do: .Font.Color? Use bold?
+        green_excel = self.rgb_to_excel_color(135, 186, 83)
+        for rc in dark_squares:
+            cell = self.get_xl_range(rc_coord=rc)
+            cell.Interior.Color = green_excel  # to-do: .Font.Color? Use bold?
 
         self.ws.Application.ActiveWindow.Zoom = 300  # %
-        self.excel_grid = self.read_grid()
 
     @retry_on_errors
     def set_xl_value(self, cell_range: "Range", value: int | str):
@@ -129,7 +193,7 @@ class CheckersExcel:
     @retry_on_errors
     def get_xl_cell(self, row: int, col: int) -> "Cells":
         xl_cell = self.ws.GetType().InvokeMember("Cells", Reflection.BindingFlags.GetProperty, None, self.ws,
-                                                 [row + 1, col + 1])  # type int only not numpy!
+                                                 [int(row) + self.y0 + 1, int(col) + self.x0 + 1])  # int not numpy!
         return xl_cell
 
     def get_xl_range(self, top_left: "Cells" = None, bottom_right: "Cells" = None,
@@ -142,18 +206,28 @@ class CheckersExcel:
                 return self.ws.get_Range(top_left, top_left)  # single cell range from Cells obj
             return self.ws.get_Range(top_left, bottom_right)  # rectangular multi-cell Range
 
-    def put_all_content_on_grid(self, cells_coords: list[tuple] | None = None):
-        """Set each affected cell value in Spreadsheet one at a time and return the whole grid"""
-        if cells_coords is None:
-            cells_coords = self.board.set_rc_coordinates
-        for rc in cells_coords:
-            # if sum(rc) % 2:  # skips white squares (empty in checkers), only valid for e.g. 8x8 board
-            self._reveal_content_in_cell(rc)
-        self.excel_grid = self.read_grid()
-
-    def _reveal_content_in_cell(self, rc: tuple[int, int]) -> None:
-        range1x1 = self.get_xl_range(rc_coord=rc).Cells[self.y0, self.x0]  # adjust for grid loc.
-        char = str(self.board.pretty[rc])
-        if not PieceType.is_piece(PieceType[PieceChar(char).name]):  # if PieceType.is_piece(self.board.val_arr[rc]):
-            char = ' '
-        self.set_xl_value(range1x1, char)
+
+class MemorySheet(GridSheet):
+    """Sheet kept in a dict, stands in for Excel e.g. to test CheckersExcel on Linux; counts write calls"""
+
+    def __init__(self):
+        self.h = self.w = 0
+        self.cells, self.dark_squares = {}, set()
+        self.writes = 0
+
+    def format_grid(self, h: int, w: int, dark_squares: Iterable[tuple[int, int]]):
+        self.h, self.w = h, w
+        self.dark_squares = set(dark_squares)
+
+    def read_grid(self) -> list[list]:
+        return [[self.cells.get((r, c)) for c in range(self.w)] for r in range(self.h)]
+
+    def write_grid(self, values: list[list]):
+        self.writes += 1
+        for r, row in enumerate(values):
+            for c, value in enumerate(row):
+                self.cells[r, c] = value
+
+    def write_cell(self, rc: tuple[int, int], value: int | str):
+        self.writes += 1
+        self.cells[rc] = value